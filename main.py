@@ -1,9 +1,12 @@
 # main.py
+import asyncio
 import logging
+import os
 from src.config import Config
 from src.clients.etherscan import EtherscanClient
 from src.clients.alchemy import AlchemyClient
 from src.utils.file_manager import FileManager
+from src.utils.cache import Cache
 from src.extractors.blockchain import BlockchainExtractor
 
 logging.basicConfig(
@@ -19,20 +22,35 @@ def main():
         daos = config.load_dao_config('config.json')
 
         # Initialize components
-        etherscan = EtherscanClient(config.etherscan_api_key)
-        alchemy = AlchemyClient(config.alchemy_api_key)
+        abi_cache = Cache(os.path.join(config.cache_dir, 'abi'))
+        etherscan = EtherscanClient(config.etherscan_api_key, cache=abi_cache)
+        alchemy = AlchemyClient(
+            config.alchemy_api_key,
+            compute_units_per_second=config.alchemy_compute_units_per_second
+        )
         file_manager = FileManager(config.output_dir)
         
         # Initialize extractor
         extractor = BlockchainExtractor(etherscan, alchemy, file_manager)
 
-        # Process DAOs
-        for dao in daos:
-            try:
-                extractor.process_dao(dao)
-            except Exception as e:
-                logger.error(f"Error processing DAO {dao.name}: {str(e)}")
-                continue
+        try:
+            # Fetch every ABI first, then extract events for all contracts concurrently
+            extractor.process_daos(daos)
+
+            # Optionally keep tailing new events over a WebSocket until interrupted
+            if config.follow_logs:
+                try:
+                    asyncio.run(extractor.follow(daos))
+                except KeyboardInterrupt:
+                    logger.info("Stopped following new events")
+        finally:
+            # Events are only appended to NDJSON while running; derive the CSVs once here
+            for dao in daos:
+                for contract in dao.contracts:
+                    try:
+                        file_manager.materialize_csv(dao.name, contract.name, 'events')
+                    except Exception as e:
+                        logger.error(f"Error writing events CSV for {contract.name}: {str(e)}")
 
     except Exception as e:
         logger.error(f"Application error: {str(e)}")
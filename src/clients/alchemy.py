@@ -1,9 +1,18 @@
 # src/clients/alchemy.py
-from typing import List, Dict, Any, Optional, Callable
-from web3 import Web3
+from typing import List, Dict, Any, Optional, Callable, Tuple, Awaitable, Union, AsyncIterator
+from collections import deque
+from contextlib import asynccontextmanager
+from web3 import Web3, AsyncWeb3, AsyncHTTPProvider, WebSocketProvider
+from requests.adapters import HTTPAdapter
+import aiohttp
+import requests
+import asyncio
+import threading
 import time
 import logging
-from tenacity import retry, stop_after_attempt, wait_exponential
+from ..utils.fastpath import format_logs
+from ..utils.rate_limit import RateLimiter
+from ..utils.retry import MAX_ATTEMPTS, backoff_delay, is_transient_error
 
 logger = logging.getLogger(__name__)
 
@@ -11,124 +20,450 @@ class AlchemyError(Exception):
     """Custom exception for Alchemy API errors"""
     pass
 
+class _LogFetch:
+    """
+    Bookkeeping for one get_logs/get_logs_async call: adaptive window, callbacks,
+    totals and progress logging, so both loops only differ in how they fetch
+    """
+    def __init__(self,
+                 client: 'AlchemyClient',
+                 from_block: int,
+                 to_block: int,
+                 window: int,
+                 on_batch_complete: Optional[Callable[[List[Dict[str, Any]]], None]],
+                 on_progress: Optional[Callable[[int, int], None]],
+                 return_logs: bool):
+        self.client = client
+        self.from_block = from_block
+        self.to_block = to_block
+        self.window = window
+        self.on_batch_complete = on_batch_complete
+        self.on_progress = on_progress
+        self.keep_logs = return_logs or on_batch_complete is None
+        self.all_logs: List[Dict[str, Any]] = []
+        self.total_logs = 0
+        self.last_progress_log = time.time()
+
+    def record(self, group: List[Tuple[int, int]], results: List[List[Dict]]) -> None:
+        """Format a fetched group, hand it to the callbacks and grow the window if it was sparse"""
+        group_start, group_end = group[0][0], group[-1][1]
+        formatted_logs = format_logs([log for logs in results for log in logs])
+        
+        if formatted_logs:
+            # Process the batch immediately if callback is provided
+            if self.on_batch_complete:
+                self.on_batch_complete(formatted_logs)
+            
+            if self.keep_logs:
+                self.all_logs.extend(formatted_logs)
+            self.total_logs += len(formatted_logs)
+            logger.info(
+                f"Retrieved and processed {len(formatted_logs)} logs for blocks {group_start}-{group_end}"
+            )
+
+        # Report the window this group was fetched with: the grown one is untested
+        # and would make a warm start open with a window that may fail
+        fetched_window = max(hi - lo + 1 for lo, hi in group)
+        self.window = self.client._next_window(self.window, results)
+        if self.on_progress:
+            self.on_progress(group_end, fetched_window)
+
+        if time.time() - self.last_progress_log >= 30:
+            total_blocks = max(self.to_block - self.from_block + 1, 1)
+            progress = (group_end - self.from_block + 1) / total_blocks * 100
+            logger.info(f"Progress: {progress:.2f}% complete")
+            self.last_progress_log = time.time()
+
+    def handle_error(self, group: List[Tuple[int, int]], error: Exception) -> None:
+        """Shrink the window if the group returned too many logs, otherwise raise AlchemyError"""
+        group_start, group_end = group[0][0], group[-1][1]
+        group_window = group[0][1] - group[0][0] + 1
+        if self.client._is_response_too_large(error) and group_window > 1:
+            self.window = max(group_window // 4, 1)
+            logger.info(
+                f"Too many logs in blocks {group_start}-{group_end}, shrinking window to {self.window} blocks"
+            )
+            return
+        logger.error(
+            f"Error fetching logs for blocks {group_start}-{group_end}: {str(error)}"
+        )
+        raise AlchemyError(f"Failed to fetch logs: {str(error)}")
+
+    def result(self) -> Union[List[Dict[str, Any]], int]:
+        logger.info(f"Completed fetching logs. Total logs found: {self.total_logs}")
+        return self.all_logs if self.keep_logs else self.total_logs
+
 class AlchemyClient:
-    def __init__(self, api_key: str, network: str = 'mainnet'):
+    # Used when a contract has no deployedAt, instead of scanning from genesis
+    DEFAULT_START_BLOCK = 12450964
+    # Compute units Alchemy charges per call; a batch costs the sum of its calls
+    GET_LOGS_COMPUTE_UNITS = 75
+    BLOCK_NUMBER_COMPUTE_UNITS = 10
+
+    def __init__(self, api_key: str, network: str = 'mainnet', pool_maxsize: int = 32,
+                 compute_units_per_second: int = 330):
         if not api_key:
             raise ValueError("Alchemy API key is required")
             
-        self.w3 = Web3(Web3.HTTPProvider(
-            f"https://eth-{network}.g.alchemy.com/v2/{api_key}"
+        url = f"https://eth-{network}.g.alchemy.com/v2/{api_key}"
+        # Keep-alive session so each JSON-RPC call reuses an open TLS connection
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=pool_maxsize,
+            pool_maxsize=pool_maxsize,
+            max_retries=0
         ))
-        self.last_request_time = 0
-        self.min_request_interval = 0.1
+        self.w3 = Web3(Web3.HTTPProvider(url, session=self.session))
+        # web3 tracks batch_requests() per provider, so concurrent batches each borrow
+        # their own AsyncWeb3 from a pool opened by async_session()
+        self._url = url
+        self.pool_maxsize = pool_maxsize
+        self._aw3_pool: Optional[asyncio.Queue] = None
+        self._aio_session: Optional[aiohttp.ClientSession] = None
+        self._aw3_users = 0
+        self.ws_url = f"wss://eth-{network}.g.alchemy.com/v2/{api_key}"
+        # Throughput budget in compute units (330/s on Alchemy's free tier). Spread over
+        # a 10s window so one full batch (windows_per_request * 75 CU) fits, while the
+        # average stays at compute_units_per_second
+        self._rate_limiter = RateLimiter(compute_units_per_second * 10, period=10.0)
+        # (block_number, monotonic fetch time), None until first fetched; the head moves ~1 block per 12s
+        self._bn_cache: Optional[Tuple[int, float]] = None
+        self._bn_cache_ttl = 10.0
+        self._bn_lock = threading.Lock()
         self.batch_size = 1000
+        # Adaptive window bounds: double while a window returns fewer than
+        # sparse_window_logs logs, divide by 4 when Alchemy says it returned too many
+        self.max_window = 100_000
+        self.sparse_window_logs = 200
+        # Block windows sent per JSON-RPC batch; bounds the response size
+        self.windows_per_request = 20
+        # Batch requests kept in flight at once by get_logs_async
+        self.max_concurrency = 10
 
-    def _throttle(self):
-        """Implement rate limiting"""
-        now = time.time()
-        time_since_last = now - self.last_request_time
-        if time_since_last < self.min_request_interval:
-            time.sleep(self.min_request_interval - time_since_last)
-        self.last_request_time = time.time()
+    def _throttle(self, compute_units: int):
+        """Wait until the compute-unit budget has room for a request"""
+        self._rate_limiter.acquire(compute_units)
 
-    def _to_checksum_address(self, address: str) -> str:
-        """Convert address to checksum format"""
+    async def _throttle_async(self, compute_units: int):
+        """Rate limiting that yields to the event loop while waiting"""
+        await self._rate_limiter.acquire_async(compute_units)
+
+    @asynccontextmanager
+    async def async_session(self) -> AsyncIterator[None]:
+        """
+        Open the pool of AsyncWeb3 instances used by the *_async methods
+        Nested or concurrent sessions on the same loop share one pool
+        """
+        if self._aw3_pool is None:
+            # One keep-alive aiohttp session shared by every pooled provider, with the
+            # same connection limit as the sync HTTPAdapter
+            self._aio_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_maxsize, ttl_dns_cache=300),
+                raise_for_status=True
+            )
+            # Published before the first await so concurrent openers share it;
+            # checkouts simply wait until the providers below are added
+            self._aw3_pool = asyncio.Queue()
+            for _ in range(self.pool_maxsize):
+                provider = AsyncHTTPProvider(self._url)
+                await provider.cache_async_session(self._aio_session)
+                self._aw3_pool.put_nowait(AsyncWeb3(provider))
+        self._aw3_users += 1
         try:
-            return Web3.to_checksum_address(address)
-        except ValueError as e:
-            logger.error(f"Invalid Ethereum address: {address}")
-            raise AlchemyError(f"Invalid Ethereum address: {address}")
-
-    def _format_log(self, log: Dict) -> Dict[str, Any]:
-        """Format a single log entry"""
-        return {
-            'blockNumber': log['blockNumber'],
-            'transactionHash': log['transactionHash'].hex(),
-            'topics': [t.hex() for t in log['topics']],
-            'data': log['data'],
-            'logIndex': log['logIndex'],
-            'transactionIndex': log['transactionIndex']
-        }
-
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
-    )
+            yield
+        finally:
+            self._aw3_users -= 1
+            if self._aw3_users == 0:
+                self._aw3_pool = None
+                await self._aio_session.close()
+                self._aio_session = None
+
+    @asynccontextmanager
+    async def _checkout_aw3(self) -> AsyncIterator[AsyncWeb3]:
+        """Borrow an AsyncWeb3 for a single request or batch"""
+        async with self.async_session():
+            aw3 = await self._aw3_pool.get()
+            try:
+                yield aw3
+            finally:
+                self._aw3_pool.put_nowait(aw3)
+
+    def _cached_head(self, max_age: float) -> Optional[int]:
+        """Cached chain head if it was fetched less than max_age seconds ago"""
+        if self._bn_cache is None:
+            return None
+        bn, fetched_at = self._bn_cache
+        if time.monotonic() - fetched_at < max_age:
+            return bn
+        return None
+
+    def latest_block(self, max_age: Optional[float] = None) -> int:
+        """Return the chain head, refetched once the cached value is older than max_age (default TTL)"""
+        max_age = self._bn_cache_ttl if max_age is None else max_age
+        with self._bn_lock:
+            cached = self._cached_head(max_age)
+            if cached is not None:
+                return cached
+            self._throttle(self.BLOCK_NUMBER_COMPUTE_UNITS)
+            bn = self.w3.eth.block_number
+            self._bn_cache = (bn, time.monotonic())
+            return bn
+
+    async def latest_block_async(self, max_age: Optional[float] = None) -> int:
+        """Async variant of latest_block"""
+        max_age = self._bn_cache_ttl if max_age is None else max_age
+        cached = self._cached_head(max_age)
+        if cached is not None:
+            return cached
+        await self._throttle_async(self.BLOCK_NUMBER_COMPUTE_UNITS)
+        async with self._checkout_aw3() as aw3:
+            bn = await aw3.eth.block_number
+        with self._bn_lock:
+            self._bn_cache = (bn, time.monotonic())
+        return bn
+
+    def _window_group(self, start_block: int, to_block: int, window: int) -> List[Tuple[int, int]]:
+        """Build up to windows_per_request inclusive (fromBlock, toBlock) windows of `window` blocks"""
+        group = []
+        current_block = start_block
+        while current_block <= to_block and len(group) < self.windows_per_request:
+            end_block = min(current_block + window - 1, to_block)
+            group.append((current_block, end_block))
+            current_block = end_block + 1
+        return group
+
+    def _next_window(self, window: int, results: List[List[Dict]]) -> int:
+        """Additive-increase step: grow the window while every request in the group came back sparse"""
+        if all(len(logs) < self.sparse_window_logs for logs in results):
+            return min(window * 2, self.max_window)
+        return window
+
+    @staticmethod
+    def _is_response_too_large(error: Exception) -> bool:
+        """Whether Alchemy rejected a window for returning too many logs"""
+        message = str(error).lower()
+        return 'query returned more than' in message or 'response size exceeded' in message
+
+    def _start_fetch(self,
+                     checksum_address: str,
+                     from_block: int,
+                     to_block: int,
+                     batch_size: Optional[int],
+                     on_batch_complete: Optional[Callable[[List[Dict[str, Any]]], None]],
+                     on_progress: Optional[Callable[[int, int], None]],
+                     return_logs: bool) -> _LogFetch:
+        """Resolve the start block and set up the bookkeeping shared by get_logs and get_logs_async"""
+        if from_block == 0:
+            from_block = self.DEFAULT_START_BLOCK
+            logger.info(f"Starting from block {from_block} instead of 0")
+            
+        logger.info(
+            f"Fetching logs for {checksum_address} from block {from_block} to {to_block}"
+        )
+        return _LogFetch(
+            self, from_block, to_block, batch_size or self.batch_size,
+            on_batch_complete, on_progress, return_logs
+        )
+
+    def _fetch_window_group(self, checksum_address: str, windows: List[Tuple[int, int]]) -> List[List[Dict]]:
+        """Fetch logs for several block windows in a single JSON-RPC batch"""
+        for attempt in range(MAX_ATTEMPTS):
+            self._throttle(len(windows) * self.GET_LOGS_COMPUTE_UNITS)
+            try:
+                with self.w3.batch_requests() as batch:
+                    for lo, hi in windows:
+                        batch.add(self.w3.eth.get_logs({
+                            'fromBlock': lo,
+                            'toBlock': hi,
+                            'address': checksum_address
+                        }))
+                    return batch.execute()
+            except Exception as e:
+                if attempt == MAX_ATTEMPTS - 1 or not is_transient_error(e):
+                    raise
+                delay = backoff_delay(attempt)
+                logger.warning(f"Transient error fetching logs, retrying in {delay:.2f}s: {str(e)}")
+                time.sleep(delay)
+
+    async def _fetch_window_group_async(self, checksum_address: str, windows: List[Tuple[int, int]]) -> List[List[Dict]]:
+        """Async variant of _fetch_window_group"""
+        for attempt in range(MAX_ATTEMPTS):
+            await self._throttle_async(len(windows) * self.GET_LOGS_COMPUTE_UNITS)
+            try:
+                async with self._checkout_aw3() as aw3:
+                    async with aw3.batch_requests() as batch:
+                        for lo, hi in windows:
+                            batch.add(aw3.eth.get_logs({
+                                'fromBlock': lo,
+                                'toBlock': hi,
+                                'address': checksum_address
+                            }))
+                        return await batch.async_execute()
+            except Exception as e:
+                if attempt == MAX_ATTEMPTS - 1 or not is_transient_error(e):
+                    raise
+                delay = backoff_delay(attempt)
+                logger.warning(f"Transient error fetching logs, retrying in {delay:.2f}s: {str(e)}")
+                await asyncio.sleep(delay)
+
     def get_logs(self, 
-                 contract_address: str, 
+                 checksum_address: str, 
                  from_block: int,
                  to_block: Optional[int] = None,
                  batch_size: Optional[int] = None,
-                 on_batch_complete: Optional[Callable[[List[Dict[str, Any]]], None]] = None) -> List[Dict[str, Any]]:
+                 on_batch_complete: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+                 on_progress: Optional[Callable[[int, int], None]] = None,
+                 return_logs: bool = True) -> Union[List[Dict[str, Any]], int]:
         """
         Fetch logs for contract with automatic pagination and streaming processing
+        Block windows are sent to Alchemy in JSON-RPC batches of `windows_per_request`,
+        and the window size adapts to the log density of the range
         Args:
-            contract_address: Contract address to get logs for
+            checksum_address: EIP-55 checksummed contract address (see Contract.checksum_address)
             from_block: Starting block number
             to_block: Ending block number (optional)
-            batch_size: Number of blocks per batch (optional)
+            batch_size: Initial number of blocks per window (optional)
             on_batch_complete: Callback function to process each batch of logs
+            on_progress: Callback receiving (last block processed, window size that fetched it)
+            return_logs: When False and on_batch_complete is given, batches are not
+                accumulated and only the number of logs is returned (constant memory)
         """
-        self._throttle()
-        batch_size = batch_size or self.batch_size
-        
         try:
-            checksum_address = self._to_checksum_address(contract_address)
-            
             if not to_block:
-                to_block = self.w3.eth.block_number
+                to_block = self.latest_block()
 
-            if from_block == 0:
-                from_block = 12450964
-                logger.info(f"Starting from block {from_block} instead of 0")
-                
-            logger.info(
-                f"Fetching logs for {checksum_address} from block {from_block} to {to_block}"
+            fetch = self._start_fetch(
+                checksum_address, from_block, to_block, batch_size,
+                on_batch_complete, on_progress, return_logs
             )
+            current_block = fetch.from_block
             
-            all_logs = []
-            current_block = from_block
-            total_blocks = to_block - from_block
-            last_progress_log = time.time()
-            
-            while current_block < to_block:
-                end_block = min(current_block + batch_size, to_block)
-                
-                if time.time() - last_progress_log >= 30:
-                    progress = (current_block - from_block) / total_blocks * 100
-                    logger.info(f"Progress: {progress:.2f}% complete")
-                    last_progress_log = time.time()
-                
+            while current_block <= to_block:
+                group = self._window_group(current_block, to_block, fetch.window)
                 try:
-                    logs = self.w3.eth.get_logs({
-                        'fromBlock': current_block,
-                        'toBlock': end_block,
-                        'address': checksum_address
-                    })
-                    
-                    if logs:
-                        formatted_logs = [self._format_log(log) for log in logs]
-                        
-                        # Process the batch immediately if callback is provided
-                        if on_batch_complete and formatted_logs:
-                            on_batch_complete(formatted_logs)
-                        
-                        all_logs.extend(formatted_logs)
-                        logger.info(
-                            f"Retrieved and processed {len(logs)} logs for blocks {current_block}-{end_block}"
-                        )
-                    
+                    results = self._fetch_window_group(checksum_address, group)
                 except Exception as e:
-                    logger.error(
-                        f"Error fetching logs for blocks {current_block}-{end_block}: {str(e)}"
-                    )
-                    raise AlchemyError(f"Failed to fetch logs: {str(e)}")
-                    
-                current_block = end_block + 1
+                    fetch.handle_error(group, e)
+                    continue
+
+                fetch.record(group, results)
+                current_block = group[-1][1] + 1
                 
-            logger.info(f"Completed fetching logs. Total logs found: {len(all_logs)}")
-            return all_logs
+            return fetch.result()
             
         except Exception as e:
             logger.error(f"Error in get_logs: {str(e)}")
-            raise AlchemyError(f"Failed to get logs: {str(e)}")
\ No newline at end of file
+            raise AlchemyError(f"Failed to get logs: {str(e)}")
+
+    async def get_logs_async(self,
+                             checksum_address: str,
+                             from_block: int,
+                             to_block: Optional[int] = None,
+                             batch_size: Optional[int] = None,
+                             on_batch_complete: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+                             on_progress: Optional[Callable[[int, int], None]] = None,
+                             max_concurrency: Optional[int] = None,
+                             return_logs: bool = True) -> Union[List[Dict[str, Any]], int]:
+        """
+        Concurrent variant of get_logs
+        Up to `max_concurrency` batch requests are in flight at once; results are
+        still handed to on_batch_complete and on_progress in block order
+        Args:
+            checksum_address: EIP-55 checksummed contract address (see Contract.checksum_address)
+            from_block: Starting block number
+            to_block: Ending block number (optional)
+            batch_size: Initial number of blocks per window (optional)
+            on_batch_complete: Callback function to process each batch of logs
+            on_progress: Callback receiving (last block processed, window size that fetched it)
+            max_concurrency: Maximum number of batch requests in flight (optional)
+            return_logs: When False and on_batch_complete is given, batches are not
+                accumulated and only the number of logs is returned (constant memory)
+        """
+        max_concurrency = max_concurrency or self.max_concurrency
+        
+        # One pool for the whole range instead of one per request
+        async with self.async_session():
+            try:
+                if not to_block:
+                    to_block = await self.latest_block_async()
+
+                fetch = self._start_fetch(
+                    checksum_address, from_block, to_block, batch_size,
+                    on_batch_complete, on_progress, return_logs
+                )
+                semaphore = asyncio.Semaphore(max_concurrency)
+
+                async def fetch_group(group: List[Tuple[int, int]]) -> List[List[Dict]]:
+                    async with semaphore:
+                        return await self._fetch_window_group_async(checksum_address, group)
+
+                # Tasks are awaited in submission order so batches stay sorted by block
+                pending = deque()
+                next_block = fetch.from_block
+            
+                try:
+                    while next_block <= to_block or pending:
+                        while next_block <= to_block and len(pending) < 2 * max_concurrency:
+                            group = self._window_group(next_block, to_block, fetch.window)
+                            pending.append((group, asyncio.create_task(fetch_group(group))))
+                            next_block = group[-1][1] + 1
+
+                        group, task = pending.popleft()
+                        try:
+                            results = await task
+                        except Exception as e:
+                            fetch.handle_error(group, e)
+                            # Everything queued after this group used a window that is too wide
+                            self._cancel_pending(pending)
+                            next_block = group[0][0]
+                            continue
+
+                        fetch.record(group, results)
+                finally:
+                    self._cancel_pending(pending)
+                
+                return fetch.result()
+            
+            except Exception as e:
+                logger.error(f"Error in get_logs_async: {str(e)}")
+                raise AlchemyError(f"Failed to get logs: {str(e)}")
+
+    async def follow_logs(self,
+                          checksum_addresses: List[str],
+                          on_logs: Callable[[str, List[Dict[str, Any]]], None],
+                          on_subscribed: Optional[Callable[[], Awaitable[None]]] = None) -> None:
+        """
+        Stream new logs for the given contracts over Alchemy's WebSocket API
+        Runs until the connection drops, which surfaces as an exception or a return
+        Args:
+            checksum_addresses: EIP-55 checksummed contract addresses to follow
+            on_logs: Callback receiving (checksum address, [formatted log]) for each new log,
+                in arrival order
+            on_subscribed: Awaited once the subscription is live, e.g. to backfill
+                the gap since the last poll; logs arriving meanwhile are buffered
+        """
+        async with AsyncWeb3(WebSocketProvider(self.ws_url)) as ws3:
+            subscription_id = await ws3.eth.subscribe('logs', {'address': checksum_addresses})
+            logger.info(f"Subscribed to logs for {len(checksum_addresses)} contracts ({subscription_id})")
+
+            if on_subscribed:
+                await on_subscribed()
+
+            async for payload in ws3.socket.process_subscriptions():
+                log = payload['result']
+                # Reorged-out logs are re-sent with removed=True; the append-only output keeps the original
+                if log.get('removed'):
+                    logger.warning(f"Ignoring removed log in tx {Web3.to_hex(log['transactionHash'])}")
+                    continue
+                on_logs(Web3.to_checksum_address(log['address']), format_logs([log]))
+
+    @staticmethod
+    def _cancel_pending(pending: deque) -> None:
+        """Cancel queued fetch tasks, consuming any errors they already raised"""
+        while pending:
+            _, task = pending.popleft()
+            if task.done():
+                if not task.cancelled():
+                    task.exception()
+            else:
+                task.cancel()
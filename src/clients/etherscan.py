@@ -1,42 +1,40 @@
 # src/clients/etherscan.py
 from typing import Optional, Dict, Any
 import requests
+from requests.adapters import HTTPAdapter
 import time
-from functools import wraps
 import logging
-from tenacity import retry, stop_after_attempt, wait_exponential
+from ..utils.cache import Cache
+from ..utils.rate_limit import RateLimiter
+from ..utils.retry import MAX_ATTEMPTS, TRANSIENT_STATUS_CODES, backoff_delay
 
 logger = logging.getLogger(__name__)
 
-def rate_limit(min_interval: float = 0.2):
-    """Rate limiting decorator for Etherscan API calls"""
-    last_call = 0
-    
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            nonlocal last_call
-            now = time.time()
-            time_passed = now - last_call
-            if time_passed < min_interval:
-                time.sleep(min_interval - time_passed)
-            last_call = time.time()
-            return func(*args, **kwargs)
-        return wrapper
-    return decorator
-
 class EtherscanError(Exception):
     """Custom exception for Etherscan API errors"""
     pass
 
 class EtherscanClient:
-    def __init__(self, api_key: str, network: str = 'mainnet'):
+    # Verified ABIs never change, the TTL only bounds how stale a proxy's ABI can get
+    ABI_CACHE_MAX_AGE = 30 * 86400
+
+    def __init__(self, api_key: str, network: str = 'mainnet', pool_maxsize: int = 8,
+                 cache: Optional[Cache] = None, requests_per_second: int = 5):
         if not api_key:
             raise ValueError("Etherscan API key is required")
             
         self.api_key = api_key
         self.base_url = self._get_base_url(network)
+        self.cache = cache
+        # Etherscan's free tier allows 5 calls/s; bursts up to that are fine
+        self._rate_limiter = RateLimiter(requests_per_second)
         self.session = requests.Session()
+        # Size the pool to the number of worker threads sharing this client
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=pool_maxsize,
+            pool_maxsize=pool_maxsize,
+            max_retries=0
+        ))
         self.session.headers.update({
             'User-Agent': 'dao-data-extractor/1.0'
         })
@@ -51,41 +49,69 @@ class EtherscanClient:
             raise ValueError(f"Unsupported network: {network}")
         return urls[network]
 
-    @rate_limit(min_interval=0.2)
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry_error_callback=lambda retry_state: None
-    )
     def get_contract_abi(self, address: str) -> Optional[str]:
         """
-        Fetch contract ABI from Etherscan
+        Fetch contract ABI, served from the cache when a fresh copy exists
+        Returns None if contract is not verified or error occurs
+        """
+        key = address.lower()
+        if self.cache and self.cache.is_valid(key, max_age=self.ABI_CACHE_MAX_AGE):
+            cached = self.cache.get(key)
+            if cached and cached.get('abi'):
+                logger.debug(f"Using cached ABI for contract: {address}")
+                return cached['abi']
+
+        abi = self._fetch_contract_abi(address)
+        if abi and self.cache:
+            self.cache.set(key, {'abi': abi})
+        return abi
+
+    def _request_abi(self, address: str) -> requests.Response:
+        """Issue a single rate-limited getabi request"""
+        self._rate_limiter.acquire()
+        return self.session.get(
+            self.base_url,
+            params={
+                'module': 'contract',
+                'action': 'getabi',
+                'address': address,
+                'apikey': self.api_key
+            },
+            timeout=30
+        )
+
+    def _fetch_contract_abi(self, address: str) -> Optional[str]:
+        """
+        Fetch contract ABI from Etherscan, retrying transient failures
         Returns None if contract is not verified or error occurs
         """
         logger.debug(f"Fetching ABI for contract: {address}")
         
-        try:
-            response = self.session.get(
-                self.base_url,
-                params={
-                    'module': 'contract',
-                    'action': 'getabi',
-                    'address': address,
-                    'apikey': self.api_key
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            if data['status'] == '1' and data['message'] == 'OK':
-                return data['result']
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                response = self._request_abi(address)
+                if response.status_code in TRANSIENT_STATUS_CODES:
+                    raise EtherscanError(f"HTTP {response.status_code}")
+                response.raise_for_status()
+                data = response.json()
                 
-            if 'Max rate limit reached' in data.get('result', ''):
-                raise EtherscanError("Rate limit reached")
+                if data['status'] == '1' and data['message'] == 'OK':
+                    return data['result']
+                    
+                if 'Max rate limit reached' in data.get('result', ''):
+                    raise EtherscanError("Rate limit reached")
+                    
+                logger.warning(f"Could not get ABI for {address}: {data.get('result')}")
+                return None
                 
-            logger.warning(f"Could not get ABI for {address}: {data.get('result')}")
-            return None
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Network error fetching ABI for {address}: {str(e)}")
-            raise EtherscanError(f"Network error: {str(e)}")
\ No newline at end of file
+            except (requests.Timeout, requests.ConnectionError, EtherscanError) as e:
+                if attempt == MAX_ATTEMPTS - 1:
+                    logger.error(f"Giving up on ABI for {address} after {MAX_ATTEMPTS} attempts: {str(e)}")
+                    return None
+                delay = backoff_delay(attempt)
+                logger.warning(f"Transient error fetching ABI for {address}, retrying in {delay:.2f}s: {str(e)}")
+                time.sleep(delay)
+                
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Network error fetching ABI for {address}: {str(e)}")
+                return None
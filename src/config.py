@@ -1,10 +1,10 @@
 # src/config.py
 from dotenv import load_dotenv, find_dotenv
 import os
-import json
 from typing import List
 import logging
 from .models.dao import DAO, Contract
+from .utils import serialization
 
 logger = logging.getLogger(__name__)
 
@@ -42,10 +42,22 @@ class Config:
     def output_dir(self) -> str:
         return os.getenv('OUTPUT_DIR', 'data')
 
+    @property
+    def cache_dir(self) -> str:
+        return os.getenv('CACHE_DIR', '.cache')
+
+    @property
+    def alchemy_compute_units_per_second(self) -> int:
+        return int(os.getenv('ALCHEMY_CUPS', '330'))
+
+    @property
+    def follow_logs(self) -> bool:
+        return os.getenv('FOLLOW_LOGS', 'false').lower() in ('1', 'true', 'yes')
+
     @staticmethod
     def load_dao_config(file_path: str) -> List[DAO]:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        with open(file_path, 'rb') as f:
+            data = serialization.loads(f.read())
             if not isinstance(data, list):
                 data = [data]  # Convert single object to list
             return [
@@ -1,101 +1,279 @@
 # src/extractors/blockchain.py
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from ..models.dao import DAO, Contract
 from ..clients.etherscan import EtherscanClient
 from ..clients.alchemy import AlchemyClient
 from ..utils.file_manager import FileManager
+from ..utils.retry import backoff_delay
 
 logger = logging.getLogger(__name__)
 
 class BlockchainExtractor:
-    def __init__(self, etherscan: EtherscanClient, alchemy: AlchemyClient, file_manager: FileManager):
+    def __init__(self, etherscan: EtherscanClient, alchemy: AlchemyClient, file_manager: FileManager,
+                 max_workers: int = 16, abi_workers: int = 5):
         self.etherscan = etherscan
         self.alchemy = alchemy
         self.file_manager = file_manager
+        # Log phase width; the ABI phase matches Etherscan's 5 calls/s free tier
+        self.max_workers = max_workers
+        self.abi_workers = abi_workers
+        # Checkpoint state per (dao_name, contract_name), read once and written through on change
+        self._progress: Dict[Tuple[str, str], Dict[str, Any]] = {}
 
     def process_dao(self, dao: DAO) -> None:
         """
         Process all contracts for a DAO, ensuring proper folder structure and data handling
         """
-        logger.info(f"Processing DAO: {dao.name}")
-        
-        for contract in dao.contracts:
-            try:
-                # Process each contract individually
-                self._process_contract(dao.name, contract)
-            except Exception as e:
-                logger.error(f"Error processing contract {contract.name}: {str(e)}")
-                continue
+        self.process_daos([dao])
 
-    def _process_contract(self, dao_name: str, contract: Contract) -> None:
+    def process_daos(self, daos: List[DAO]) -> None:
         """
-        Process a single contract, handling ABI and events
+        Process every contract of every DAO in two phases: all ABIs first, then all events,
+        so Etherscan calls never stall the Alchemy log fetches and vice versa
         """
-        logger.info(f"Processing contract: {contract.name} ({contract.address})")
+        for dao in daos:
+            logger.info(f"Processing DAO: {dao.name} ({len(dao.contracts)} contracts)")
 
-        # Step 1: Create necessary directories
-        self.file_manager._ensure_contract_dir(dao_name, contract.name)
+        targets = [(dao.name, contract) for dao in daos for contract in dao.contracts]
 
-        # Step 2: Get and save ABI
-        abi = self._get_and_save_abi(dao_name, contract)
-        if not abi:
-            logger.error(f"Could not retrieve ABI for contract {contract.name}. Skipping event processing.")
-            return
+        # Phase 1: ABIs
+        abis = self._get_and_save_abis(targets)
 
-        # Step 3: Process Events
-        self._process_events(dao_name, contract)
+        # Phase 2: Events, only for contracts whose ABI is available
+        ready = []
+        for dao_name, contract in targets:
+            if abis.get((dao_name, contract.name)):
+                ready.append((dao_name, contract))
+            else:
+                logger.error(f"Could not retrieve ABI for contract {contract.name}. Skipping event processing.")
+
+        # Warm the chain-head cache once so the contract tasks don't each fetch it
+        try:
+            self.alchemy.latest_block()
+        except Exception as e:
+            logger.warning(f"Could not prefetch latest block: {str(e)}")
 
-    def _get_and_save_abi(self, dao_name: str, contract: Contract) -> Optional[str]:
+        asyncio.run(self._process_all_events(ready))
+
+    def _get_and_save_abis(self, targets: List[Tuple[str, Contract]]) -> Dict[Tuple[str, str], str]:
         """
-        Retrieve and save contract ABI
-        Returns the ABI if successful, None otherwise
+        Retrieve and save the ABI of every contract, fetching each distinct address once
+        Returns ABIs keyed by (dao_name, contract_name); contracts without one are left out
         """
-        try:
-            logger.info(f"Retrieving ABI for contract: {contract.name}")
-            abi = self.etherscan.get_contract_abi(contract.address)
-            
-            if not abi:
-                logger.warning(f"No ABI found for contract {contract.name}")
+        abis: Dict[Tuple[str, str], str] = {}
+        missing: Dict[str, List[Tuple[str, Contract]]] = defaultdict(list)
+
+        for dao_name, contract in targets:
+            self.file_manager._ensure_contract_dir(dao_name, contract.name)
+            saved = self.file_manager.load_contract_data(dao_name, contract.name, 'abi')
+            if saved and saved[0].get('abi'):
+                logger.info(f"Using saved ABI for contract {contract.name}")
+                abis[(dao_name, contract.name)] = saved[0]['abi']
+            else:
+                missing[contract.address].append((dao_name, contract))
+
+        def fetch_abi(address: str) -> Optional[str]:
+            try:
+                logger.info(f"Retrieving ABI for contract: {address}")
+                return self.etherscan.get_contract_abi(address)
+            except Exception as e:
+                logger.error(f"Error retrieving ABI for contract {address}: {str(e)}")
                 return None
 
-            # Save ABI as both JSON and CSV
-            self.file_manager.save_contract_data(
-                dao_name=dao_name,
-                contract_name=contract.name,
-                data_type='abi',
-                data=[{'abi': abi}],
-                append=False  # ABI should always be overwritten as it's a single entity
-            )
-            
-            logger.info(f"Successfully saved ABI for contract {contract.name}")
-            return abi
+        with ThreadPoolExecutor(max_workers=self.abi_workers) as executor:
+            fetched = dict(zip(missing, executor.map(fetch_abi, missing)))
 
-        except Exception as e:
-            logger.error(f"Error retrieving ABI for contract {contract.name}: {str(e)}")
-            return None
+        for address, owners in missing.items():
+            abi = fetched[address]
+            for dao_name, contract in owners:
+                if not abi:
+                    logger.warning(f"No ABI found for contract {contract.name}")
+                    continue
+                try:
+                    # Save ABI as both JSON and CSV
+                    self.file_manager.save_contract_data(
+                        dao_name=dao_name,
+                        contract_name=contract.name,
+                        data_type='abi',
+                        data=[{'abi': abi}],
+                        append=False  # ABI should always be overwritten as it's a single entity
+                    )
+                    logger.info(f"Successfully saved ABI for contract {contract.name}")
+                    abis[(dao_name, contract.name)] = abi
+                except Exception as e:
+                    logger.error(f"Error saving ABI for contract {contract.name}: {str(e)}")
+
+        return abis
+
+    def _get_progress(self, dao_name: str, contract: Contract) -> Dict[str, Any]:
+        """Checkpoint state of a contract, loaded from disk on first use"""
+        key = (dao_name, contract.name)
+        if key not in self._progress:
+            self._progress[key] = {
+                'last_block': self.file_manager.read_checkpoint(dao_name, contract.name),
+                'window': self.file_manager.read_block_window(dao_name, contract.name),
+                'last_log': self.file_manager.read_high_water(dao_name, contract.name),
+            }
+        return self._progress[key]
+
+    def _write_progress(self, dao_name: str, contract: Contract, **changes: Any) -> None:
+        """Update a contract's checkpoint state and write it through to checkpoint.json"""
+        progress = self._get_progress(dao_name, contract)
+        progress.update(changes)
+        if progress['last_block'] is None:
+            return
+        self.file_manager.write_checkpoint(
+            dao_name, contract.name, progress['last_block'],
+            progress['window'], progress['last_log']
+        )
+
+    def _save_events(self, dao_name: str, contract: Contract, logs: List[Dict[str, Any]]) -> None:
+        """
+        Append the logs past the contract's (blockNumber, logIndex) high-water mark
+        to its event files, so refetched blocks never produce duplicate rows
+        """
+        last_log = self._get_progress(dao_name, contract)['last_log']
+        if last_log is not None:
+            logs = [log for log in logs if (log['blockNumber'], log['logIndex']) > last_log]
+        if not logs:
+            return
+
+        self.file_manager.save_contract_data(
+            dao_name=dao_name,
+            contract_name=contract.name,
+            data_type='events',
+            data=logs,
+            append=True
+        )
+        self._write_progress(
+            dao_name, contract,
+            last_log=max((log['blockNumber'], log['logIndex']) for log in logs)
+        )
 
-    def _process_events(self, dao_name: str, contract: Contract) -> None:
+    async def _process_all_events(self, targets: List[Tuple[str, Contract]]) -> None:
         """
-        Process and save contract events
+        Process and save events of every contract as tasks on one event loop,
+        at most max_workers contracts at a time, sharing one Alchemy async session
+        """
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def process(dao_name: str, contract: Contract) -> None:
+            async with semaphore:
+                try:
+                    await self._process_events_async(dao_name, contract)
+                except Exception as e:
+                    logger.error(f"Error processing events for contract {contract.name}: {str(e)}")
+
+        async with self.alchemy.async_session():
+            await asyncio.gather(*(process(dao_name, contract) for dao_name, contract in targets))
+
+    async def _process_events_async(self, dao_name: str, contract: Contract,
+                                    to_block: Optional[int] = None) -> None:
+        """
+        Fetch and save every log after the contract's checkpoint up to to_block (default: chain head)
         """
         def process_batch(logs: List[Dict[str, Any]]) -> None:
             """Handle each batch of logs as they come in"""
-            if logs:
-                self.file_manager.save_contract_data(
-                    dao_name=dao_name,
-                    contract_name=contract.name,
-                    data_type='events',
-                    data=logs,
-                    append=True
-                )
+            self._save_events(dao_name, contract, logs)
 
-        try:
-            # Get logs with batch processing
-            self.alchemy.get_logs(
-                contract_address=contract.address,
-                from_block=contract.deployed_at or 0,
-                on_batch_complete=process_batch
-            )
-        except Exception as e:
-            logger.error(f"Error processing events for contract {contract.name}: {str(e)}")
\ No newline at end of file
+        def save_progress(last_block: int, window: int) -> None:
+            """Checkpoint after each group; its logs were already saved by process_batch"""
+            self._write_progress(dao_name, contract, last_block=last_block, window=window)
+
+        progress = self._get_progress(dao_name, contract)
+        from_block = contract.deployed_at or 0
+        checkpoint = progress['last_block']
+        if checkpoint is not None:
+            from_block = max(from_block, checkpoint + 1)
+            logger.info(f"Resuming {contract.name} from checkpoint at block {checkpoint}")
+
+        # Get logs concurrently, streaming each batch to disk as it completes
+        await self.alchemy.get_logs_async(
+            checksum_address=contract.checksum_address,
+            from_block=from_block,
+            to_block=to_block,
+            batch_size=progress['window'],
+            on_batch_complete=process_batch,
+            on_progress=save_progress,
+            return_logs=False  # batches are already on disk; don't hold them in memory
+        )
+
+    async def follow(self,
+                     daos: List[DAO],
+                     fallback_after: float = 60.0,
+                     poll_interval: float = 12.0) -> None:
+        """
+        Tail new events over a WebSocket subscription once the backfill is done
+        Every (re)connect first polls the gap since each contract's checkpoint; if the
+        socket stays down for more than `fallback_after` seconds, polling continues every
+        `poll_interval` seconds until the subscription comes back
+        """
+        # The same address may be listed under several DAOs; each entry keeps its own files
+        targets: Dict[str, List[Tuple[str, Contract]]] = defaultdict(list)
+        for dao in daos:
+            for contract in dao.contracts:
+                if self._get_progress(dao.name, contract)['last_block'] is not None:
+                    targets[contract.checksum_address].append((dao.name, contract))
+        if not targets:
+            logger.warning("No backfilled contracts to follow")
+            return
+
+        async def catch_up() -> None:
+            """Poll every followed contract up to the chain head"""
+            # A cached head could predate the subscription and leave a gap, so refetch it
+            try:
+                head = await self.alchemy.latest_block_async(max_age=0)
+            except Exception as e:
+                logger.error(f"Could not fetch latest block: {str(e)}")
+                return
+            for dao_name, contract in (entry for entries in targets.values() for entry in entries):
+                try:
+                    await self._process_events_async(dao_name, contract, to_block=head)
+                except Exception as e:
+                    logger.error(f"Error catching up events for contract {contract.name}: {str(e)}")
+
+        def on_logs(checksum_address: str, logs: List[Dict[str, Any]]) -> None:
+            if not logs:
+                return
+            # Later logs from the same block may still arrive, so only the previous block is
+            # complete; refetching it after a reconnect is deduplicated by the high-water mark
+            last_block = max(log['blockNumber'] for log in logs) - 1
+            for dao_name, contract in targets.get(checksum_address, []):
+                # Logs buffered while catching up may already be on disk; the mark skips them too
+                self._save_events(dao_name, contract, logs)
+                if last_block > self._get_progress(dao_name, contract)['last_block']:
+                    self._write_progress(dao_name, contract, last_block=last_block)
+
+        disconnected_since: Optional[float] = None
+        attempt = 0
+
+        async def on_subscribed() -> None:
+            nonlocal disconnected_since, attempt
+            disconnected_since = None
+            attempt = 0
+            await catch_up()
+
+        logger.info(f"Following new events for {sum(map(len, targets.values()))} contracts")
+        async with self.alchemy.async_session():
+            while True:
+                try:
+                    await self.alchemy.follow_logs(list(targets), on_logs, on_subscribed=on_subscribed)
+                    logger.warning("Log subscription closed")
+                except Exception as e:
+                    logger.warning(f"Log subscription dropped: {str(e)}")
+
+                if disconnected_since is None:
+                    disconnected_since = time.monotonic()
+
+                if time.monotonic() - disconnected_since > fallback_after:
+                    logger.info("WebSocket still unavailable, polling for new events")
+                    await catch_up()
+                    await asyncio.sleep(poll_interval)
+                else:
+                    await asyncio.sleep(backoff_delay(attempt))
+                    attempt += 1
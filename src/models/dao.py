@@ -1,6 +1,7 @@
 # src/models/dao.py
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional
+from web3 import Web3
 
 @dataclass
 class Contract:
@@ -8,11 +9,14 @@ class Contract:
     type: str
     name: str
     deployed_at: Optional[int] = None
+    checksum_address: str = field(init=False, repr=False)
 
     def __post_init__(self):
         self.address = self.address.lower()
         if not self.address.startswith('0x'):
             raise ValueError("Contract address must start with '0x'")
+        # Computed once here so the log-fetch path never re-hashes the address
+        self.checksum_address = Web3.to_checksum_address(self.address)
 
 @dataclass
 class DAO:
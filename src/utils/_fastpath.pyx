@@ -0,0 +1,47 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+# src/utils/_fastpath.pyx
+"""
+Compiled versions of the pure-Python fallbacks in src/utils/fastpath.py
+Build in place with: cythonize -i src/utils/_fastpath.pyx
+Output must stay byte-for-byte identical to the fallbacks (see tests/test_fastpath.py)
+"""
+
+cpdef list format_logs(list raw):
+    cdef list out = []
+    cdef list topics
+    cdef object log, topic
+    for log in raw:
+        topics = []
+        for topic in log['topics']:
+            topics.append('0x' + bytes.hex(topic))
+        out.append({
+            'blockNumber': log['blockNumber'],
+            'transactionHash': '0x' + bytes.hex(log['transactionHash']),
+            'topics': topics,
+            'data': '0x' + bytes.hex(log['data']),
+            'logIndex': log['logIndex'],
+            'transactionIndex': log['transactionIndex']
+        })
+    return out
+
+cdef inline str _csv_field(object value):
+    # Same rule as csv.QUOTE_MINIMAL with the default dialect
+    cdef str s = str(value)
+    if ',' in s or '"' in s or '\n' in s or '\r' in s:
+        return '"' + s.replace('"', '""') + '"'
+    return s
+
+cpdef bytes rows_to_csv(list data, tuple fieldnames):
+    cdef list lines = []
+    cdef list fields
+    cdef str line
+    cdef object row, key
+    for row in data:
+        fields = [_csv_field(row.get(key, '')) for key in fieldnames]
+        line = ','.join(fields)
+        # csv quotes a lone empty field so the row isn't read back as blank
+        if len(fields) == 1 and not line:
+            line = '""'
+        lines.append(line)
+        lines.append('\r\n')
+    return ''.join(lines).encode('utf-8')
@@ -1,10 +1,11 @@
 # src/utils/cache.py
-import json
 import os
 from typing import Dict, Any, Optional
 import logging
+import threading
 from pathlib import Path
 import time
+from . import serialization
 
 logger = logging.getLogger(__name__)
 
@@ -13,22 +14,23 @@ class Cache:
     def __init__(self, cache_dir: str):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
         self._load_metadata()
 
     def _load_metadata(self):
         """Load or initialize cache metadata"""
         self.metadata_path = self.cache_dir / 'metadata.json'
         try:
-            with open(self.metadata_path, 'r') as f:
-                self.metadata = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+            with open(self.metadata_path, 'rb') as f:
+                self.metadata = serialization.loads(f.read())
+        except (FileNotFoundError, serialization.JSONDecodeError):
             self.metadata = {'last_updated': {}, 'versions': {}}
             self._save_metadata()
 
     def _save_metadata(self):
-        """Save cache metadata"""
-        with open(self.metadata_path, 'w') as f:
-            json.dump(self.metadata, f, indent=2)
+        """Save cache metadata (small, so kept human-readable)"""
+        with open(self.metadata_path, 'wb') as f:
+            f.write(serialization.dumps(self.metadata, indent=True))
 
     def get(self, key: str) -> Optional[Dict[str, Any]]:
         """Retrieve data from cache"""
@@ -37,9 +39,9 @@ class Cache:
             return None
             
         try:
-            with open(cache_file, 'r') as f:
-                return json.load(f)
-        except json.JSONDecodeError:
+            with open(cache_file, 'rb') as f:
+                return serialization.loads(f.read())
+        except serialization.JSONDecodeError:
             logger.warning(f"Corrupted cache file: {key}")
             return None
 
@@ -47,12 +49,13 @@ class Cache:
         """Store data in cache with versioning"""
         cache_file = self.cache_dir / f"{key}.json"
         try:
-            with open(cache_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            with open(cache_file, 'wb') as f:
+                f.write(serialization.dumps(data))
             
-            self.metadata['last_updated'][key] = int(time.time())
-            self.metadata['versions'][key] = version
-            self._save_metadata()
+            with self._lock:
+                self.metadata['last_updated'][key] = int(time.time())
+                self.metadata['versions'][key] = version
+                self._save_metadata()
             
         except Exception as e:
             logger.error(f"Error writing to cache: {str(e)}")
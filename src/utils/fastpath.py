@@ -0,0 +1,44 @@
+# src/utils/fastpath.py
+"""
+Per-log hot loops: log formatting and CSV row encoding
+Uses the compiled src/utils/_fastpath extension when it has been built
+(`cythonize -i src/utils/_fastpath.pyx`), otherwise these pure-Python versions
+"""
+import csv
+import io
+from typing import Any, Dict, List, Sequence
+
+_hex = bytes.hex
+
+def _format_logs_py(raw: List[Any]) -> List[Dict[str, Any]]:
+    """Format raw web3 log entries into plain, serializable dicts"""
+    # bytes.hex is the C-level encoder; Web3.to_hex type-dispatches per value.
+    # Encoding data here also keeps the serializers off their str() fallback
+    return [
+        {
+            'blockNumber': log['blockNumber'],
+            'transactionHash': '0x' + _hex(log['transactionHash']),
+            'topics': ['0x' + _hex(t) for t in log['topics']],
+            'data': '0x' + _hex(log['data']),
+            'logIndex': log['logIndex'],
+            'transactionIndex': log['transactionIndex']
+        }
+        for log in raw
+    ]
+
+def _rows_to_csv_py(data: List[Dict[str, Any]], fieldnames: Sequence[str]) -> bytes:
+    """Encode rows as UTF-8 CSV lines (csv module dialect) in `fieldnames` order"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        tuple(str(row.get(k, '')) for k in fieldnames) for row in data
+    )
+    return buffer.getvalue().encode('utf-8')
+
+# The fallbacks stay importable so tests can compare them with the compiled versions
+try:
+    from ._fastpath import format_logs, rows_to_csv
+    COMPILED = True
+except ImportError:
+    format_logs = _format_logs_py
+    rows_to_csv = _rows_to_csv_py
+    COMPILED = False
@@ -1,17 +1,38 @@
 # src/utils/file_manager.py
 import os
-import json
 import csv
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple, Callable
 import logging
+import threading
+from collections import defaultdict
 from pathlib import Path
+from . import serialization
+from .fastpath import rows_to_csv
 
 logger = logging.getLogger(__name__)
 
 class FileManager:
+    # Columns produced by fastpath.format_logs, in the sorted order earlier runs used
+    EVENT_FIELDNAMES = (
+        'blockNumber',
+        'data',
+        'logIndex',
+        'topics',
+        'transactionHash',
+        'transactionIndex'
+    )
+
     def __init__(self, base_dir: str):
         self.base_dir = base_dir
         os.makedirs(base_dir, exist_ok=True)
+        # One lock per (dao, contract, data_type) so concurrent writers never interleave
+        self._locks = defaultdict(threading.Lock)
+        self._locks_guard = threading.Lock()
+
+    def _get_lock(self, dao_name: str, contract_name: str, data_type: str) -> threading.Lock:
+        """Return the lock guarding the files of a single data type"""
+        with self._locks_guard:
+            return self._locks[(dao_name, contract_name, data_type)]
 
     def _ensure_contract_dir(self, dao_name: str, contract_name: str) -> str:
         """Ensure the contract directory exists and return its path"""
@@ -26,6 +47,15 @@ class FileManager:
             fieldnames.update(item.keys())
         return fieldnames
 
+    def _write_csv_rows(self, csv_path: str, data: List[Dict[str, Any]]) -> None:
+        """Overwrite a CSV file with rows under a sorted header derived from the data"""
+        all_fieldnames = sorted(self._get_all_fieldnames(data))
+        with open(csv_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=all_fieldnames)
+            writer.writeheader()
+            for row in data:
+                writer.writerow({k: str(row.get(k, '')) for k in all_fieldnames})
+
     def save_contract_data(self, 
                           dao_name: str, 
                           contract_name: str, 
@@ -33,7 +63,9 @@ class FileManager:
                           data: List[Dict[str, Any]],
                           append: bool = True) -> None:
         """
-        Save contract data in both JSON and CSV formats
+        Save contract data
+        Appends go to <data_type>.ndjson only (see materialize_csv for the CSV);
+        overwrites write <data_type>.json and <data_type>.csv
         Args:
             dao_name: Name of the DAO
             contract_name: Name of the contract
@@ -45,26 +77,35 @@ class FileManager:
             logger.warning(f"No data to save for {dao_name}/{contract_name}/{data_type}")
             return
 
+        with self._get_lock(dao_name, contract_name, data_type):
+            self._save_contract_data(dao_name, contract_name, data_type, data, append)
+
+    def _save_contract_data(self,
+                            dao_name: str,
+                            contract_name: str,
+                            data_type: str,
+                            data: List[Dict[str, Any]],
+                            append: bool) -> None:
+        """Write data to disk; caller must hold the data type lock"""
         dir_path = self._ensure_contract_dir(dao_name, contract_name)
         
+        if append:
+            # Hot path: a single append-only NDJSON write, one record per line
+            json_path = os.path.join(dir_path, f"{data_type}.ndjson")
+            try:
+                with open(json_path, 'ab') as f:
+                    f.writelines(serialization.dumps(row) + b'\n' for row in data)
+                logger.info(f"Appended NDJSON data to {json_path}")
+            except Exception as e:
+                logger.error(f"Error saving NDJSON data: {str(e)}")
+                raise
+            return
+
         # Handle JSON
         json_path = os.path.join(dir_path, f"{data_type}.json")
         try:
-            existing_data = []
-            if append and os.path.exists(json_path):
-                with open(json_path, 'r') as f:
-                    try:
-                        existing_data = json.load(f)
-                        if not isinstance(existing_data, list):
-                            existing_data = [existing_data]
-                    except json.JSONDecodeError:
-                        logger.warning(f"Could not read existing JSON file: {json_path}")
-                        existing_data = []
-            
-            final_data = existing_data + data
-            
-            with open(json_path, 'w') as f:
-                json.dump(final_data, f, indent=2, default=str)
+            with open(json_path, 'wb') as f:
+                f.write(serialization.dumps(data))
             logger.info(f"Saved JSON data to {json_path}")
             
         except Exception as e:
@@ -74,49 +115,178 @@ class FileManager:
         # Handle CSV
         csv_path = os.path.join(dir_path, f"{data_type}.csv")
         try:
-            # Get existing fieldnames if file exists
-            existing_fieldnames = set()
-            if append and os.path.exists(csv_path):
-                with open(csv_path, 'r', newline='') as f:
-                    reader = csv.reader(f)
-                    try:
-                        existing_fieldnames = set(next(reader))
-                    except StopIteration:
-                        pass
-
-            # Get all fieldnames (existing + new)
-            all_fieldnames = sorted(self._get_all_fieldnames(data, existing_fieldnames))
-
-            # Determine if we need to rewrite the whole file
-            need_rewrite = append and existing_fieldnames and (set(all_fieldnames) != existing_fieldnames)
-
-            if need_rewrite:
-                # Read existing data
-                existing_data = []
-                with open(csv_path, 'r', newline='') as f:
-                    reader = csv.DictReader(f)
-                    existing_data = list(reader)
-                
-                # Write everything with new fieldnames
-                with open(csv_path, 'w', newline='') as f:
-                    writer = csv.DictWriter(f, fieldnames=all_fieldnames)
-                    writer.writeheader()
-                    for row in existing_data:
-                        writer.writerow({k: row.get(k, '') for k in all_fieldnames})
-                    for row in data:
-                        writer.writerow({k: str(row.get(k, '')) for k in all_fieldnames})
-            else:
-                # Simple append or new file
-                mode = 'a' if append and os.path.exists(csv_path) else 'w'
-                with open(csv_path, mode, newline='') as f:
-                    writer = csv.DictWriter(f, fieldnames=all_fieldnames)
-                    if mode == 'w' or not append:
-                        writer.writeheader()
-                    for row in data:
-                        writer.writerow({k: str(row.get(k, '')) for k in all_fieldnames})
-
-            logger.info(f"{'Appended' if append else 'Saved'} CSV data to {csv_path}")
+            self._write_csv_rows(csv_path, data)
+            logger.info(f"Saved CSV data to {csv_path}")
 
         except Exception as e:
             logger.error(f"Error saving CSV data: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    def materialize_csv(self, dao_name: str, contract_name: str, data_type: str,
+                        chunk_size: int = 10000) -> Optional[str]:
+        """
+        Regenerate <data_type>.csv from the appended <data_type>.ndjson
+        Events use the fixed EVENT_FIELDNAMES columns and take a single streaming pass;
+        other data types first scan the file for the union of their keys
+        Returns the CSV path, or None if there is no NDJSON file to convert
+        """
+        dir_path = os.path.join(self.base_dir, dao_name, contract_name)
+        ndjson_path = os.path.join(dir_path, f"{data_type}.ndjson")
+        csv_path = os.path.join(dir_path, f"{data_type}.csv")
+        tmp_path = f"{csv_path}.tmp"
+        if not os.path.exists(ndjson_path):
+            return None
+
+        with self._get_lock(dao_name, contract_name, data_type):
+            if data_type == 'events':
+                fieldnames = self.EVENT_FIELDNAMES
+            else:
+                keys = set()
+                for row in self._iter_ndjson(ndjson_path):
+                    keys.update(row.keys())
+                fieldnames = tuple(sorted(keys))
+
+            with open(tmp_path, 'wb') as f:
+                # Non-event keys come from the data, so quote the header like any row
+                f.write(rows_to_csv([dict(zip(fieldnames, fieldnames))], fieldnames))
+                chunk = []
+                for row in self._iter_ndjson(ndjson_path):
+                    chunk.append(row)
+                    if len(chunk) >= chunk_size:
+                        f.write(rows_to_csv(chunk, fieldnames))
+                        chunk = []
+                if chunk:
+                    f.write(rows_to_csv(chunk, fieldnames))
+            os.replace(tmp_path, csv_path)
+
+        logger.info(f"Materialized {csv_path} from {ndjson_path}")
+        return csv_path
+
+    def _iter_ndjson(self, ndjson_path: str):
+        """Yield the records of an NDJSON file, skipping blank or truncated lines"""
+        with open(ndjson_path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield serialization.loads(line)
+                except serialization.JSONDecodeError:
+                    logger.warning(f"Skipping unreadable line in {ndjson_path}")
+
+    def _read_checkpoint_file(self, dao_name: str, contract_name: str) -> Dict[str, Any]:
+        """Load checkpoint.json for a contract, or {} if there is none"""
+        checkpoint_path = os.path.join(self.base_dir, dao_name, contract_name, 'checkpoint.json')
+        try:
+            with open(checkpoint_path, 'rb') as f:
+                checkpoint = serialization.loads(f.read())
+        except FileNotFoundError:
+            return {}
+        except serialization.JSONDecodeError:
+            logger.warning(f"Ignoring unreadable checkpoint: {checkpoint_path}")
+            return {}
+        return checkpoint if isinstance(checkpoint, dict) else {}
+
+    def _read_checkpoint_field(self, dao_name: str, contract_name: str, key: str,
+                               convert: Callable[[Any], Any]) -> Any:
+        """Return convert(checkpoint[key]), or None if the field is missing or malformed"""
+        value = self._read_checkpoint_file(dao_name, contract_name).get(key)
+        if value is None:
+            return None
+        try:
+            return convert(value)
+        except (KeyError, IndexError, TypeError, ValueError):
+            logger.warning(f"Ignoring malformed '{key}' in checkpoint of {dao_name}/{contract_name}")
+            return None
+
+    def read_checkpoint(self, dao_name: str, contract_name: str) -> Optional[int]:
+        """Return the highest block already processed for a contract, or None if there is none"""
+        return self._read_checkpoint_field(dao_name, contract_name, 'last_block', int)
+
+    def read_block_window(self, dao_name: str, contract_name: str) -> Optional[int]:
+        """Return the last block window size that worked for a contract, for warm starts"""
+        return self._read_checkpoint_field(
+            dao_name, contract_name, 'window', lambda window: int(window) or None
+        )
+
+    def read_high_water(self, dao_name: str, contract_name: str) -> Optional[Tuple[int, int]]:
+        """Return the (blockNumber, logIndex) of the last event saved for a contract, or None"""
+        return self._read_checkpoint_field(
+            dao_name, contract_name, 'last_log', lambda last_log: (int(last_log[0]), int(last_log[1]))
+        )
+
+    def write_checkpoint(self, dao_name: str, contract_name: str, last_block: int,
+                         window: Optional[int] = None,
+                         last_log: Optional[Tuple[int, int]] = None) -> None:
+        """
+        Atomically record the highest block processed, the current block window and
+        the (blockNumber, logIndex) high-water mark of the last event saved
+        """
+        dir_path = self._ensure_contract_dir(dao_name, contract_name)
+        checkpoint_path = os.path.join(dir_path, 'checkpoint.json')
+        tmp_path = f"{checkpoint_path}.tmp"
+
+        checkpoint = {'last_block': last_block}
+        if window is not None:
+            checkpoint['window'] = window
+        if last_log is not None:
+            checkpoint['last_log'] = list(last_log)
+
+        with self._get_lock(dao_name, contract_name, 'checkpoint'):
+            with open(tmp_path, 'wb') as f:
+                f.write(serialization.dumps(checkpoint))
+            os.replace(tmp_path, checkpoint_path)
+
+    def load_contract_data(self, dao_name: str, contract_name: str, data_type: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Load previously saved <data_type>.json for a contract
+        Returns None if the file is missing, empty or unreadable
+        """
+        json_path = os.path.join(self.base_dir, dao_name, contract_name, f"{data_type}.json")
+        if not os.path.exists(json_path) or os.path.getsize(json_path) == 0:
+            return None
+
+        try:
+            with open(json_path, 'rb') as f:
+                data = serialization.loads(f.read())
+        except serialization.JSONDecodeError:
+            logger.warning(f"Could not read existing JSON file: {json_path}")
+            return None
+
+        if not isinstance(data, list):
+            data = [data]
+        return data or None
+
+    def consolidate_ndjson(self, dao_name: str, contract_name: str, data_type: str) -> str:
+        """
+        Convert an appended NDJSON file into a single JSON array file
+        Each line is parsed only to validate it and is then copied verbatim; blank and
+        truncated lines (e.g. from an interrupted append) are skipped
+        Returns the path of the written JSON file
+        """
+        dir_path = self._ensure_contract_dir(dao_name, contract_name)
+        ndjson_path = os.path.join(dir_path, f"{data_type}.ndjson")
+        json_path = os.path.join(dir_path, f"{data_type}.json")
+        tmp_path = f"{json_path}.tmp"
+
+        with self._get_lock(dao_name, contract_name, data_type):
+            with open(ndjson_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+                dst.write(b'[')
+                first = True
+                for line in src:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        serialization.loads(line)
+                    except serialization.JSONDecodeError:
+                        logger.warning(f"Skipping unreadable line in {ndjson_path}")
+                        continue
+                    if not first:
+                        dst.write(b',\n')
+                    dst.write(line)
+                    first = False
+                dst.write(b']\n')
+            os.replace(tmp_path, json_path)
+
+        logger.info(f"Consolidated {ndjson_path} into {json_path}")
+        return json_path
@@ -0,0 +1,48 @@
+# src/utils/rate_limit.py
+import asyncio
+import threading
+import time
+from collections import deque
+
+class RateLimiter:
+    """
+    Sliding-window limiter allowing bursts of up to `max_calls` units per `period` seconds
+    Each call takes `n` units (1 by default, e.g. the compute units of a request);
+    a call heavier than the whole budget waits for an empty window
+    Thread-safe; callers reserve a slot under the lock and wait outside it, so the
+    same limiter serves worker threads and asyncio tasks alike
+    """
+    def __init__(self, max_calls: int, period: float = 1.0):
+        self.max_calls = max_calls
+        self.period = period
+        # (slot time, units) in the order slots were granted
+        self._slots = deque()
+        self._used = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, n: int = 1) -> float:
+        """Claim the next slot with room for n units and return how many seconds to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            # Slots are granted in order, so a new one never precedes the last
+            slot = max(now, self._slots[-1][0]) if self._slots else now
+            while self._slots and (self._slots[0][0] <= slot - self.period
+                                   or self._used + n > self.max_calls):
+                granted, units = self._slots.popleft()
+                self._used -= units
+                slot = max(slot, granted + self.period)
+            self._slots.append((slot, n))
+            self._used += n
+            return slot - now
+
+    def acquire(self, n: int = 1) -> None:
+        """Block until a slot with room for n units is available"""
+        delay = self.reserve(n)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, n: int = 1) -> None:
+        """Wait for a slot with room for n units without blocking the event loop"""
+        delay = self.reserve(n)
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -0,0 +1,23 @@
+# src/utils/retry.py
+import asyncio
+import random
+import aiohttp
+import requests
+
+MAX_ATTEMPTS = 3
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff capped at 2s, with a little jitter to spread out retries"""
+    return min(0.25 * (1 << attempt), 2.0) + random.random() * 0.1
+
+def is_transient_error(error: Exception) -> bool:
+    """Whether an HTTP error is worth retrying (timeouts, dropped connections, 429/5xx)"""
+    if isinstance(error, (requests.Timeout, requests.ConnectionError,
+                          asyncio.TimeoutError, aiohttp.ClientConnectionError)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in TRANSIENT_STATUS_CODES
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in TRANSIENT_STATUS_CODES
+    return False
@@ -0,0 +1,17 @@
+# src/utils/serialization.py
+from typing import Any, Union
+import orjson
+
+# orjson's decode error subclasses json.JSONDecodeError, so existing handlers still match
+JSONDecodeError = orjson.JSONDecodeError
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to JSON bytes; unknown types (e.g. HexBytes) fall back to str()"""
+    option = orjson.OPT_SERIALIZE_NUMPY
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(obj, option=option, default=str)
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON bytes or str"""
+    return orjson.loads(data)
@@ -0,0 +1,8 @@
+# tests/conftest.py
+import pytest
+from src.utils.file_manager import FileManager
+
+@pytest.fixture
+def file_manager(tmp_path):
+    """FileManager writing under a per-test temporary directory"""
+    return FileManager(str(tmp_path))
@@ -0,0 +1,250 @@
+# tests/test_alchemy.py
+import asyncio
+import types
+import pytest
+import requests
+
+pytest.importorskip('web3')
+
+from src.clients.alchemy import AlchemyClient, AlchemyError
+
+# One log every 5 blocks, plus a dense range that overflows wide windows
+LOG_BLOCKS = sorted(set(range(1000, 50000, 5)) | set(range(20000, 20400)))
+DENSE_LIMIT = 150
+
+def _raw_log(block):
+    return {
+        'blockNumber': block,
+        'transactionHash': b'\x01' * 32,
+        'topics': [],
+        'data': b'',
+        'logIndex': 0,
+        'transactionIndex': 0,
+    }
+
+def _fake_fetch(requested, cancelled, fail_on=None):
+    async def fetch(checksum_address, windows):
+        requested.append(windows)
+        try:
+            await asyncio.sleep(0.001 * (len(requested) % 3))
+        except asyncio.CancelledError:
+            cancelled.append(windows)
+            raise
+        results = []
+        for lo, hi in windows:
+            if fail_on is not None and lo <= fail_on <= hi:
+                raise ValueError('execution reverted')
+            logs = [_raw_log(b) for b in LOG_BLOCKS if lo <= b <= hi]
+            if len(logs) > DENSE_LIMIT:
+                raise ValueError('query returned more than 10000 results')
+            results.append(logs)
+        return results
+    return fetch
+
+@pytest.fixture
+def client():
+    return AlchemyClient('test-key')
+
+def test_latest_block_cache_starts_empty(client, monkeypatch):
+    calls = []
+
+    class FakeEth:
+        @property
+        def block_number(self):
+            calls.append(1)
+            return 19_000_000
+
+    monkeypatch.setattr(client, 'w3', types.SimpleNamespace(eth=FakeEth()))
+
+    assert client.latest_block() == 19_000_000
+    assert client.latest_block() == 19_000_000
+    assert len(calls) == 1
+    assert client.latest_block(max_age=0) == 19_000_000
+    assert len(calls) == 2
+
+def test_latest_block_async_shares_the_cache(client, monkeypatch):
+    calls = []
+
+    async def fetch_head():
+        calls.append(1)
+        return 19_000_000
+
+    class FakeEth:
+        @property
+        def block_number(self):
+            return fetch_head()
+
+    class FakeCheckout:
+        async def __aenter__(self):
+            return types.SimpleNamespace(eth=FakeEth())
+
+        async def __aexit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(client, '_checkout_aw3', FakeCheckout)
+
+    assert asyncio.run(client.latest_block_async()) == 19_000_000
+    assert asyncio.run(client.latest_block_async()) == 19_000_000
+    assert len(calls) == 1
+    assert client.latest_block() == 19_000_000
+    assert len(calls) == 1
+    assert asyncio.run(client.latest_block_async(max_age=0)) == 19_000_000
+    assert len(calls) == 2
+
+def test_batches_are_charged_per_get_logs_call(client, monkeypatch):
+    charged = []
+    monkeypatch.setattr(client._rate_limiter, 'acquire', charged.append)
+
+    class FakeBatch:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def add(self, request):
+            pass
+
+        def execute(self):
+            return [[], [], []]
+
+    class FakeEth:
+        def get_logs(self, params):
+            return params
+
+    monkeypatch.setattr(client, 'w3', types.SimpleNamespace(
+        eth=FakeEth(), batch_requests=FakeBatch
+    ))
+
+    client._fetch_window_group('0x0000000000000000000000000000000000000001', [(1, 10), (11, 20), (21, 30)])
+
+    assert charged == [3 * AlchemyClient.GET_LOGS_COMPUTE_UNITS]
+
+def test_get_logs_async_shrinks_window_and_cancels_stale_groups(client, monkeypatch):
+    requested, cancelled, batches, progress = [], [], [], []
+    monkeypatch.setattr(client, '_fetch_window_group_async', _fake_fetch(requested, cancelled))
+
+    total = asyncio.run(client.get_logs_async(
+        '0x0000000000000000000000000000000000000001',
+        from_block=1000,
+        to_block=49999,
+        batch_size=100,
+        on_batch_complete=lambda logs: batches.append([log['blockNumber'] for log in logs]),
+        on_progress=lambda last_block, window: progress.append((last_block, window)),
+        max_concurrency=3,
+        return_logs=False,
+    ))
+
+    delivered = [block for batch in batches for block in batch]
+    assert total == len(LOG_BLOCKS)
+    assert delivered == LOG_BLOCKS
+    assert progress[-1][0] == 49999
+    assert [block for block, _ in progress] == sorted(block for block, _ in progress)
+
+    windows = [window for _, window in progress]
+    shrunk = [i for i in range(1, len(windows)) if windows[i] < windows[i - 1]]
+    assert shrunk, "window never shrank after a too-large response"
+    assert cancelled, "groups queued behind the failed one were not cancelled"
+
+def test_get_logs_async_returns_logs_in_order(client, monkeypatch):
+    monkeypatch.setattr(client, '_fetch_window_group_async', _fake_fetch([], []))
+
+    logs = asyncio.run(client.get_logs_async(
+        '0x0000000000000000000000000000000000000001',
+        from_block=1000,
+        to_block=49999,
+        batch_size=100,
+        max_concurrency=4,
+    ))
+
+    assert [log['blockNumber'] for log in logs] == LOG_BLOCKS
+    assert logs[0]['transactionHash'] == '0x' + '01' * 32
+
+def test_get_logs_async_raises_on_other_errors(client, monkeypatch):
+    cancelled = []
+    monkeypatch.setattr(client, '_fetch_window_group_async', _fake_fetch([], cancelled, fail_on=5000))
+
+    with pytest.raises(AlchemyError):
+        asyncio.run(client.get_logs_async(
+            '0x0000000000000000000000000000000000000001',
+            from_block=1000,
+            to_block=49999,
+            batch_size=100,
+            max_concurrency=3,
+        ))
+
+def test_progress_reports_the_window_that_fetched_the_group(client, monkeypatch):
+    """Warm starts reuse the reported window, so it must be one that worked"""
+    widest_accepted = 50
+
+    async def fetch(checksum_address, windows):
+        if any(hi - lo + 1 > widest_accepted for lo, hi in windows):
+            raise ValueError('query returned more than 10000 results')
+        return [[] for _ in windows]
+
+    monkeypatch.setattr(client, '_fetch_window_group_async', fetch)
+    client.windows_per_request = 2
+    progress = []
+
+    asyncio.run(client.get_logs_async(
+        '0x0000000000000000000000000000000000000001',
+        from_block=1,
+        to_block=2000,
+        batch_size=10,
+        on_progress=lambda last_block, window: progress.append((last_block, window)),
+        max_concurrency=2,
+    ))
+
+    assert progress[-1][0] == 2000
+    assert all(window <= widest_accepted for _, window in progress)
+    assert max(window for _, window in progress) > 10
+
+def _failing_w3(errors):
+    """Fake Web3 whose batch raises the queued errors before succeeding"""
+    attempts = []
+
+    class FakeBatch:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def add(self, request):
+            pass
+
+        def execute(self):
+            attempts.append(1)
+            if errors:
+                raise errors.pop(0)
+            return [[]]
+
+    class FakeEth:
+        def get_logs(self, params):
+            return params
+
+    return types.SimpleNamespace(eth=FakeEth(), batch_requests=FakeBatch), attempts
+
+def _http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.HTTPError(response=response)
+
+@pytest.mark.parametrize('status', [429, 503])
+def test_fetch_window_group_retries_429_and_5xx(client, monkeypatch, status):
+    w3, attempts = _failing_w3([_http_error(status)])
+    monkeypatch.setattr(client, 'w3', w3)
+    monkeypatch.setattr('src.clients.alchemy.time.sleep', lambda delay: None)
+
+    assert client._fetch_window_group('0x0000000000000000000000000000000000000001', [(1, 10)]) == [[]]
+    assert len(attempts) == 2
+
+@pytest.mark.parametrize('error', [_http_error(400), ValueError('query returned more than 10000 results')])
+def test_fetch_window_group_does_not_retry_other_errors(client, monkeypatch, error):
+    w3, attempts = _failing_w3([error])
+    monkeypatch.setattr(client, 'w3', w3)
+    monkeypatch.setattr('src.clients.alchemy.time.sleep', lambda delay: None)
+
+    with pytest.raises(type(error)):
+        client._fetch_window_group('0x0000000000000000000000000000000000000001', [(1, 10)])
+    assert len(attempts) == 1
@@ -0,0 +1,169 @@
+# tests/test_blockchain.py
+import asyncio
+from contextlib import asynccontextmanager
+import pytest
+
+pytest.importorskip('web3')
+
+from src.extractors.blockchain import BlockchainExtractor
+from src.models.dao import DAO, Contract
+
+ADDRESS = '0x00000000000000000000000000000000000000aa'
+
+class StopFollowing(BaseException):
+    """Ends follow()'s reconnect loop, which only catches Exception"""
+
+def _log(block, index):
+    return {
+        'blockNumber': block,
+        'transactionHash': f"0x{block:064x}",
+        'topics': [],
+        'data': '0x',
+        'logIndex': index,
+        'transactionIndex': 0,
+    }
+
+class FakeAlchemy:
+    """
+    Serves logs up to `head` from an in-memory chain; each follow_logs call plays
+    the next scripted WebSocket session
+    """
+    def __init__(self, chain, head):
+        self.chain = chain
+        self.head = head
+        self.sessions = []
+        self.fetched_ranges = []
+
+    @asynccontextmanager
+    async def async_session(self):
+        yield
+
+    def latest_block(self, max_age=None):
+        return self.head
+
+    async def latest_block_async(self, max_age=None):
+        return self.head
+
+    async def get_logs_async(self, checksum_address, from_block, to_block=None, batch_size=None,
+                             on_batch_complete=None, on_progress=None, return_logs=True):
+        to_block = to_block or self.head
+        self.fetched_ranges.append((from_block, to_block))
+        logs = [log for log in self.chain if from_block <= log['blockNumber'] <= to_block]
+        if logs:
+            on_batch_complete(logs)
+        on_progress(to_block, batch_size or 1000)
+        return len(logs)
+
+    async def follow_logs(self, checksum_addresses, on_logs, on_subscribed=None):
+        if not self.sessions:
+            raise StopFollowing()
+        await self.sessions.pop(0)(on_logs, on_subscribed)
+
+def _saved(file_manager, dao_name='dao'):
+    path = f"{file_manager.base_dir}/{dao_name}/contract/events.ndjson"
+    return [(row['blockNumber'], row['logIndex']) for row in file_manager._iter_ndjson(path)]
+
+def _keys(logs):
+    return [(log['blockNumber'], log['logIndex']) for log in logs]
+
+@pytest.fixture
+def contract():
+    return Contract(address=ADDRESS, type='governor', name='contract', deployed_at=100)
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr('src.extractors.blockchain.backoff_delay', lambda attempt: 0)
+
+def test_save_events_skips_logs_at_or_below_high_water_mark(file_manager, contract):
+    extractor = BlockchainExtractor(None, None, file_manager)
+    extractor._write_progress('dao', contract, last_block=99)
+
+    extractor._save_events('dao', contract, [_log(100, 0), _log(100, 1)])
+    extractor._save_events('dao', contract, [_log(100, 0), _log(100, 1)])
+    extractor._save_events('dao', contract, [_log(100, 1), _log(101, 0)])
+
+    assert _saved(file_manager) == [(100, 0), (100, 1), (101, 0)]
+    assert file_manager.read_high_water('dao', 'contract') == (101, 0)
+
+    # A new run picks the mark up from checkpoint.json
+    restarted = BlockchainExtractor(None, None, file_manager)
+    restarted._save_events('dao', contract, [_log(101, 0), _log(102, 0)])
+    assert _saved(file_manager) == [(100, 0), (100, 1), (101, 0), (102, 0)]
+
+def test_follow_reconnect_replays_without_duplicates(file_manager, contract):
+    chain = [_log(block, index) for block in range(100, 112) for index in range(2)]
+    alchemy = FakeAlchemy(chain, head=104)
+    extractor = BlockchainExtractor(None, alchemy, file_manager)
+    dao = DAO(name='dao', description='', contracts=[contract], chain_id=1)
+
+    asyncio.run(extractor._process_all_events([('dao', contract)]))
+    assert _saved(file_manager) == _keys(chain[:10])
+
+    async def first_session(on_logs, on_subscribed):
+        await on_subscribed()
+        alchemy.head = 106
+        # A log already saved by the catch-up, then only the first log of block 105
+        on_logs(contract.checksum_address, [_log(104, 1)])
+        on_logs(contract.checksum_address, [_log(105, 0)])
+        raise ConnectionError("socket closed")
+
+    async def second_session(on_logs, on_subscribed):
+        alchemy.head = 108
+        # Catch-up refetches block 105, whose first log is already on disk
+        await on_subscribed()
+        for log in [_log(107, 1), _log(108, 0), _log(108, 1), _log(109, 0)]:
+            on_logs(contract.checksum_address, [log])
+
+    alchemy.sessions = [first_session, second_session]
+    with pytest.raises(StopFollowing):
+        asyncio.run(extractor.follow([dao]))
+
+    assert _saved(file_manager) == _keys(chain[:19])
+    assert (105, 108) in alchemy.fetched_ranges
+    assert file_manager.read_checkpoint('dao', 'contract') == 108
+    assert file_manager.read_high_water('dao', 'contract') == (109, 0)
+
+def test_follow_fans_out_to_every_dao_listing_an_address(file_manager):
+    chain = [_log(block, 0) for block in range(100, 106)]
+    alchemy = FakeAlchemy(chain, head=102)
+    extractor = BlockchainExtractor(None, alchemy, file_manager)
+    daos = [
+        DAO(name=name, description='', chain_id=1, contracts=[
+            Contract(address=ADDRESS.upper().replace('0X', '0x'), type='governor', name='contract', deployed_at=100)
+        ])
+        for name in ('first', 'second')
+    ]
+    targets = [(dao.name, dao.contracts[0]) for dao in daos]
+    asyncio.run(extractor._process_all_events(targets))
+
+    async def session(on_logs, on_subscribed):
+        alchemy.head = 104
+        await on_subscribed()
+        on_logs(daos[0].contracts[0].checksum_address, [_log(104, 0), _log(105, 0)])
+
+    alchemy.sessions = [session]
+    with pytest.raises(StopFollowing):
+        asyncio.run(extractor.follow(daos))
+
+    expected = [(block, 0) for block in range(100, 106)]
+    assert _saved(file_manager, 'first') == expected
+    assert _saved(file_manager, 'second') == expected
+
+class FakeEtherscan:
+    def __init__(self, abi):
+        self.abi = abi
+        self.requested = []
+
+    def get_contract_abi(self, address):
+        self.requested.append(address)
+        return self.abi
+
+def test_saved_abi_skips_etherscan(file_manager, contract):
+    etherscan = FakeEtherscan('[{"type":"event"}]')
+    extractor = BlockchainExtractor(etherscan, None, file_manager)
+
+    first = extractor._get_and_save_abis([('dao', contract)])
+    second = extractor._get_and_save_abis([('dao', contract)])
+
+    assert first == second == {('dao', 'contract'): '[{"type":"event"}]'}
+    assert etherscan.requested == [contract.address]
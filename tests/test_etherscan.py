@@ -0,0 +1,65 @@
+# tests/test_etherscan.py
+import time
+import pytest
+from src.clients.etherscan import EtherscanClient
+from src.utils.cache import Cache
+
+ABI = '[{"type":"event","name":"ProposalCreated","inputs":[]}]'
+ADDRESS = '0x00000000000000000000000000000000000000AA'
+
+@pytest.fixture
+def abi_cache(tmp_path):
+    return Cache(str(tmp_path / 'abi'))
+
+def _client(cache, monkeypatch, result=ABI):
+    client = EtherscanClient('test-key', cache=cache)
+    calls = []
+
+    def fetch(address):
+        calls.append(address)
+        return result
+
+    monkeypatch.setattr(client, '_fetch_contract_abi', fetch)
+    return client, calls
+
+def test_abi_is_fetched_once_and_then_served_from_cache(abi_cache, monkeypatch):
+    client, calls = _client(abi_cache, monkeypatch)
+
+    assert client.get_contract_abi(ADDRESS) == ABI
+    assert client.get_contract_abi(ADDRESS.lower()) == ABI
+    assert calls == [ADDRESS]
+
+def test_cached_abi_survives_a_new_run(abi_cache, tmp_path, monkeypatch):
+    client, _ = _client(abi_cache, monkeypatch)
+    client.get_contract_abi(ADDRESS)
+
+    # A new process reloads the cache metadata from disk
+    restarted, calls = _client(Cache(str(tmp_path / 'abi')), monkeypatch)
+    assert restarted.get_contract_abi(ADDRESS) == ABI
+    assert calls == []
+
+def test_expired_abi_is_refetched(abi_cache, monkeypatch):
+    client, calls = _client(abi_cache, monkeypatch)
+    client.get_contract_abi(ADDRESS)
+
+    key = ADDRESS.lower()
+    abi_cache.metadata['last_updated'][key] = int(time.time()) - EtherscanClient.ABI_CACHE_MAX_AGE - 1
+
+    assert client.get_contract_abi(ADDRESS) == ABI
+    assert len(calls) == 2
+
+def test_unverified_contract_is_not_cached(abi_cache, monkeypatch):
+    client, calls = _client(abi_cache, monkeypatch, result=None)
+
+    assert client.get_contract_abi(ADDRESS) is None
+    assert client.get_contract_abi(ADDRESS) is None
+    assert len(calls) == 2
+    assert abi_cache.get(ADDRESS.lower()) is None
+
+def test_corrupted_cache_entry_is_refetched(abi_cache, monkeypatch):
+    client, calls = _client(abi_cache, monkeypatch)
+    client.get_contract_abi(ADDRESS)
+    (abi_cache.cache_dir / f"{ADDRESS.lower()}.json").write_bytes(b'{"abi": "[{')
+
+    assert client.get_contract_abi(ADDRESS) == ABI
+    assert len(calls) == 2
@@ -0,0 +1,110 @@
+# tests/test_fastpath.py
+import csv
+import io
+import pytest
+from src.utils import fastpath
+
+EDGE_VALUES = [
+    'plain',
+    'comma,inside',
+    'quote"inside',
+    '"fully quoted"',
+    'line\nfeed',
+    'carriage\rreturn',
+    'crlf\r\nboth',
+    '',
+    ' leading space',
+    'ünïcødé',
+    None,
+    0,
+    12450964,
+    1.5,
+]
+
+class HexBytesLike(bytes):
+    """Stands in for web3's HexBytes, a bytes subclass"""
+
+@pytest.fixture(scope='module')
+def compiled():
+    """The Cython module, built on the fly with pyximport if it isn't built in place"""
+    try:
+        from src.utils import _fastpath
+        return _fastpath
+    except ImportError:
+        pass
+    pyximport = pytest.importorskip('pyximport')
+    importers = pyximport.install(language_level=3)
+    try:
+        from src.utils import _fastpath
+    except ImportError as e:
+        pytest.skip(f"Cannot build src/utils/_fastpath.pyx: {e}")
+    finally:
+        pyximport.uninstall(*importers)
+    return _fastpath
+
+def _rows():
+    rows = [{'a': value, 'b': 'x', 'c': value} for value in EDGE_VALUES]
+    rows.append({'a': 'missing b and c'})
+    return rows
+
+def _raw_logs():
+    return [
+        {
+            'blockNumber': 12450964,
+            'transactionHash': HexBytesLike(b'\x00\x01\xab' * 11),
+            'topics': [HexBytesLike(b'\xff' * 32), b'\x00' * 32],
+            'data': b'\xde\xad\xbe\xef',
+            'logIndex': 3,
+            'transactionIndex': 7,
+        },
+        {
+            'blockNumber': 1,
+            'transactionHash': b'',
+            'topics': [],
+            'data': b'',
+            'logIndex': 0,
+            'transactionIndex': 0,
+        },
+    ]
+
+def test_fallback_rows_match_csv_module():
+    fieldnames = ('a', 'b', 'c')
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in _rows():
+        writer.writerow([str(row.get(k, '')) for k in fieldnames])
+    assert fastpath._rows_to_csv_py(_rows(), fieldnames) == buffer.getvalue().encode('utf-8')
+
+def test_fallback_rows_round_trip():
+    fieldnames = ('a', 'b', 'c')
+    encoded = fastpath._rows_to_csv_py(_rows(), fieldnames).decode('utf-8')
+    parsed = list(csv.reader(io.StringIO(encoded, newline='')))
+    assert parsed == [[str(row.get(k, '')) for k in fieldnames] for row in _rows()]
+
+@pytest.mark.parametrize('fieldnames', [('a', 'b', 'c'), ('a',), ('c', 'a')])
+def test_rows_to_csv_compiled_matches_fallback(compiled, fieldnames):
+    assert compiled.rows_to_csv(_rows(), fieldnames) == fastpath._rows_to_csv_py(_rows(), fieldnames)
+
+@pytest.mark.parametrize('value', ['', None])
+def test_rows_to_csv_single_empty_field(compiled, value):
+    rows = [{'a': value}]
+    expected = fastpath._rows_to_csv_py(rows, ('a',))
+    assert compiled.rows_to_csv(rows, ('a',)) == expected
+    if value == '':
+        assert expected == b'""\r\n'
+
+def test_rows_to_csv_empty(compiled):
+    assert compiled.rows_to_csv([], ('a',)) == fastpath._rows_to_csv_py([], ('a',)) == b''
+
+def test_format_logs_fallback():
+    formatted = fastpath._format_logs_py(_raw_logs())
+    assert formatted[0]['transactionHash'] == '0x' + '0001ab' * 11
+    assert formatted[0]['topics'] == ['0x' + 'ff' * 32, '0x' + '00' * 32]
+    assert formatted[0]['data'] == '0xdeadbeef'
+    assert formatted[1]['topics'] == []
+    assert formatted[1]['data'] == '0x'
+    assert all(type(v) is str for log in formatted for v in (log['transactionHash'], log['data']))
+
+def test_format_logs_compiled_matches_fallback(compiled):
+    assert compiled.format_logs(_raw_logs()) == fastpath._format_logs_py(_raw_logs())
+    assert compiled.format_logs([]) == []
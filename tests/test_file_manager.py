@@ -0,0 +1,123 @@
+# tests/test_file_manager.py
+import csv
+import json
+import os
+import pytest
+from src.utils.file_manager import FileManager
+
+def _event(block, index):
+    return {
+        'blockNumber': block,
+        'transactionHash': '0x' + 'ab' * 32,
+        'topics': ['0x' + '01' * 32],
+        'data': '0x',
+        'logIndex': index,
+        'transactionIndex': 0,
+    }
+
+def _ndjson_path(file_manager, data_type):
+    return os.path.join(file_manager.base_dir, 'dao', 'contract', f"{data_type}.ndjson")
+
+def _truncate_last_append(file_manager, data_type):
+    """Simulate a run interrupted in the middle of writing a line"""
+    with open(_ndjson_path(file_manager, data_type), 'ab') as f:
+        f.write(b'{"blockNumber": 9, "transactionHa')
+
+def _read_csv(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+def _write_raw_checkpoint(file_manager, content):
+    dir_path = file_manager._ensure_contract_dir('dao', 'contract')
+    with open(os.path.join(dir_path, 'checkpoint.json'), 'wb') as f:
+        f.write(content)
+
+def test_checkpoint_round_trip(file_manager):
+    assert file_manager.read_checkpoint('dao', 'contract') is None
+    assert file_manager.read_block_window('dao', 'contract') is None
+
+    file_manager.write_checkpoint('dao', 'contract', 120, window=800)
+
+    assert file_manager.read_checkpoint('dao', 'contract') == 120
+    assert file_manager.read_block_window('dao', 'contract') == 800
+
+def test_high_water_mark_round_trip(file_manager):
+    assert file_manager.read_high_water('dao', 'contract') is None
+
+    file_manager.write_checkpoint('dao', 'contract', 120, window=800, last_log=(121, 4))
+
+    assert file_manager.read_high_water('dao', 'contract') == (121, 4)
+    assert file_manager.read_checkpoint('dao', 'contract') == 120
+
+def test_unreadable_checkpoint_is_ignored(file_manager):
+    _write_raw_checkpoint(file_manager, b'{"last_bl')
+
+    assert file_manager.read_checkpoint('dao', 'contract') is None
+    assert file_manager.read_block_window('dao', 'contract') is None
+
+@pytest.mark.parametrize('content', [
+    b'{"last_block": "12a", "window": "wide"}',
+    b'{"last_block": [120], "window": {"size": 800}}',
+    b'[120, 800]',
+])
+def test_malformed_checkpoint_fields_are_ignored(file_manager, content):
+    _write_raw_checkpoint(file_manager, content)
+
+    assert file_manager.read_checkpoint('dao', 'contract') is None
+    assert file_manager.read_block_window('dao', 'contract') is None
+
+def test_malformed_field_does_not_hide_the_others(file_manager):
+    _write_raw_checkpoint(file_manager, b'{"last_block": 120, "window": "wide"}')
+
+    assert file_manager.read_checkpoint('dao', 'contract') == 120
+    assert file_manager.read_block_window('dao', 'contract') is None
+
+@pytest.mark.parametrize('last_log', [b'5', b'[121]', b'"ab"', b'[121, "x"]', b'{"block": 121}'])
+def test_malformed_high_water_mark_is_ignored(file_manager, last_log):
+    _write_raw_checkpoint(file_manager, b'{"last_block": 120, "last_log": ' + last_log + b'}')
+
+    assert file_manager.read_high_water('dao', 'contract') is None
+    assert file_manager.read_checkpoint('dao', 'contract') == 120
+
+def test_materialize_events_csv(file_manager):
+    events = [_event(1, 0), _event(1, 1), _event(2, 0)]
+    file_manager.save_contract_data('dao', 'contract', 'events', events[:2], append=True)
+    file_manager.save_contract_data('dao', 'contract', 'events', events[2:], append=True)
+    _truncate_last_append(file_manager, 'events')
+
+    csv_path = file_manager.materialize_csv('dao', 'contract', 'events', chunk_size=2)
+
+    rows = _read_csv(csv_path)
+    assert rows[0] == list(FileManager.EVENT_FIELDNAMES)
+    assert [row[0] for row in rows[1:]] == ['1', '1', '2']
+    assert [row[2] for row in rows[1:]] == ['0', '1', '0']
+    assert not os.path.exists(csv_path + '.tmp')
+
+def test_materialize_csv_uses_union_of_keys(file_manager):
+    file_manager.save_contract_data('dao', 'contract', 'votes', [{'b': 'x,y'}, {'a': 1}], append=True)
+    _truncate_last_append(file_manager, 'votes')
+
+    rows = _read_csv(file_manager.materialize_csv('dao', 'contract', 'votes'))
+
+    assert rows == [['a', 'b'], ['', 'x,y'], ['1', '']]
+
+def test_materialize_csv_without_ndjson(file_manager):
+    assert file_manager.materialize_csv('dao', 'contract', 'events') is None
+
+def test_materialize_csv_quotes_header(file_manager):
+    rows = [{'plain': 1, 'with,comma': 2, 'with"quote': 3}]
+    file_manager.save_contract_data('dao', 'contract', 'votes', rows, append=True)
+
+    parsed = _read_csv(file_manager.materialize_csv('dao', 'contract', 'votes'))
+
+    assert parsed == [['plain', 'with"quote', 'with,comma'], ['1', '3', '2']]
+
+def test_consolidate_ndjson_skips_truncated_line(file_manager):
+    events = [_event(1, 0), _event(2, 0)]
+    file_manager.save_contract_data('dao', 'contract', 'events', events, append=True)
+    _truncate_last_append(file_manager, 'events')
+
+    json_path = file_manager.consolidate_ndjson('dao', 'contract', 'events')
+
+    with open(json_path, 'rb') as f:
+        assert json.load(f) == events
@@ -0,0 +1,96 @@
+# tests/test_rate_limit.py
+import asyncio
+import threading
+import time
+from src.utils.rate_limit import RateLimiter
+
+def _max_in_window(times, period):
+    times = sorted(times)
+    return max(
+        sum(1 for t in times[i:] if t - start < period)
+        for i, start in enumerate(times)
+    )
+
+def test_reserve_allows_burst_then_spaces_slots():
+    limiter = RateLimiter(3, period=0.5)
+    delays = [limiter.reserve() for _ in range(6)]
+    assert delays[:3] == [0, 0, 0]
+    for delay in delays[3:]:
+        assert 0.4 < delay <= 0.5
+
+def test_acquire_across_threads_respects_limit():
+    limiter = RateLimiter(4, period=0.2)
+    times = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(3):
+            limiter.acquire()
+            with lock:
+                times.append(time.monotonic())
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(times) == 12
+    # 12 calls at 4 per 0.2s need at least two full periods
+    assert time.monotonic() - start >= 0.4 - 0.01
+    # Allow for the sleep/monotonic jitter at the window edges
+    assert _max_in_window(times, 0.2 - 0.02) <= 4
+
+def test_acquire_async_respects_limit():
+    limiter = RateLimiter(2, period=0.2)
+    times = []
+
+    async def call():
+        await limiter.acquire_async()
+        times.append(time.monotonic())
+
+    async def main():
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    start = time.monotonic()
+    asyncio.run(main())
+    assert time.monotonic() - start >= 0.4 - 0.01
+    assert _max_in_window(times, 0.2 - 0.02) <= 2
+
+def test_weighted_reserve_counts_units():
+    limiter = RateLimiter(100, period=0.5)
+    assert limiter.reserve(60) == 0
+    assert limiter.reserve(40) == 0
+    # The window is full: 30 more units wait until the first 60 expire
+    assert 0.4 < limiter.reserve(30) <= 0.5
+    # Granted in order, so a light call can't jump ahead of the waiting one
+    assert 0.4 < limiter.reserve(1) <= 0.5
+
+def test_weight_above_budget_waits_for_an_empty_window():
+    limiter = RateLimiter(10, period=0.5)
+    assert limiter.reserve(3) == 0
+    assert 0.4 < limiter.reserve(25) <= 0.5
+    assert 0.9 < limiter.reserve(1) <= 1.0
+
+def test_weighted_acquire_across_threads_respects_budget():
+    limiter = RateLimiter(10, period=0.2)
+    grants = []
+    lock = threading.Lock()
+
+    def worker(units):
+        for _ in range(3):
+            limiter.acquire(units)
+            with lock:
+                grants.append((time.monotonic(), units))
+
+    threads = [threading.Thread(target=worker, args=(units,)) for units in (1, 3, 4, 6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    grants.sort()
+    for start, _ in grants:
+        in_window = sum(units for t, units in grants if start <= t < start + 0.2 - 0.02)
+        assert in_window <= 10
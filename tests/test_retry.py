@@ -0,0 +1,92 @@
+# tests/test_retry.py
+import asyncio
+import aiohttp
+import pytest
+import requests
+from src.clients.etherscan import EtherscanClient
+from src.utils.retry import MAX_ATTEMPTS, backoff_delay, is_transient_error
+
+ABI = '[{"type":"event"}]'
+
+def _response(status_code, payload=b''):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = payload
+    response.url = 'https://api.etherscan.io/api'
+    return response
+
+def _http_error(status_code):
+    return requests.HTTPError(response=_response(status_code))
+
+def _aiohttp_error(status):
+    return aiohttp.ClientResponseError(None, (), status=status)
+
+@pytest.mark.parametrize('status', [429, 500, 502, 503, 504])
+def test_429_and_5xx_are_transient(status):
+    assert is_transient_error(_http_error(status))
+    assert is_transient_error(_aiohttp_error(status))
+
+@pytest.mark.parametrize('status', [400, 401, 403, 404])
+def test_other_http_errors_are_not_retried(status):
+    assert not is_transient_error(_http_error(status))
+    assert not is_transient_error(_aiohttp_error(status))
+
+@pytest.mark.parametrize('error', [
+    requests.Timeout(),
+    requests.ConnectionError(),
+    asyncio.TimeoutError(),
+    aiohttp.ClientConnectionError(),
+])
+def test_network_failures_are_transient(error):
+    assert is_transient_error(error)
+
+@pytest.mark.parametrize('error', [ValueError('execution reverted'), KeyError('result')])
+def test_other_errors_are_not_transient(error):
+    assert not is_transient_error(error)
+
+def test_backoff_is_sub_second_and_capped():
+    for attempt in range(MAX_ATTEMPTS):
+        assert 0.25 * (1 << attempt) <= backoff_delay(attempt) <= 0.25 * (1 << attempt) + 0.1
+    assert backoff_delay(10) <= 2.1
+
+def _etherscan(monkeypatch, responses):
+    client = EtherscanClient('test-key')
+    requested = []
+
+    def request_abi(address):
+        requested.append(address)
+        return responses.pop(0)
+
+    monkeypatch.setattr(client, '_request_abi', request_abi)
+    monkeypatch.setattr('src.clients.etherscan.time.sleep', lambda delay: None)
+    return client, requested
+
+def _ok():
+    return _response(200, b'{"status": "1", "message": "OK", "result": "' + ABI.replace('"', '\\"').encode() + b'"}')
+
+@pytest.mark.parametrize('status', [429, 503])
+def test_etherscan_retries_429_and_5xx(monkeypatch, status):
+    client, requested = _etherscan(monkeypatch, [_response(status), _ok()])
+
+    assert client._fetch_contract_abi('0xabc') == ABI
+    assert len(requested) == 2
+
+def test_etherscan_gives_up_after_max_attempts(monkeypatch):
+    client, requested = _etherscan(monkeypatch, [_response(502)] * MAX_ATTEMPTS)
+
+    assert client._fetch_contract_abi('0xabc') is None
+    assert len(requested) == MAX_ATTEMPTS
+
+@pytest.mark.parametrize('status', [400, 403, 404])
+def test_etherscan_does_not_retry_other_status_codes(monkeypatch, status):
+    client, requested = _etherscan(monkeypatch, [_response(status), _ok()])
+
+    assert client._fetch_contract_abi('0xabc') is None
+    assert len(requested) == 1
+
+def test_etherscan_retries_its_rate_limit_message(monkeypatch):
+    rate_limited = _response(200, b'{"status": "0", "message": "NOTOK", "result": "Max rate limit reached"}')
+    client, requested = _etherscan(monkeypatch, [rate_limited, _ok()])
+
+    assert client._fetch_contract_abi('0xabc') == ABI
+    assert len(requested) == 2